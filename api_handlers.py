@@ -1,15 +1,35 @@
-from fastapi import HTTPException
+import asyncio
+from fastapi import HTTPException, Response
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from audio_recorder import audio_recorder
+from typing import List, Dict, Any, Literal, Optional
+from audio_recorder import (
+    audio_recorder,
+    RecordingInProgressError,
+    NoRecordingInProgressError,
+    DeviceNotFoundError,
+)
+
+
+# HTTP status codes for recorder errors; any other ValueError maps to 400
+ERROR_STATUS_CODES = {
+    RecordingInProgressError: 409,
+    NoRecordingInProgressError: 409,
+    DeviceNotFoundError: 404,
+}
 
 
 class DeviceSelection(BaseModel):
     device_id: int
 
 
+class StartRequest(BaseModel):
+    stream_file_path: Optional[str] = None
+    dtype: Literal["float32", "int16"] = "float32"
+
+
 class SaveRequest(BaseModel):
     file_path: str
+    dtype: Optional[Literal["float32", "int16"]] = None
 
 
 class NormalizeRequest(BaseModel):
@@ -20,25 +40,38 @@ class TrimSilenceRequest(BaseModel):
     margin_seconds: float = 0.1
 
 
+def to_http_exception(error: ValueError) -> HTTPException:
+    """Map a recorder error to an HTTP exception"""
+    return HTTPException(status_code=ERROR_STATUS_CODES.get(type(error), 400), detail=str(error))
+
+
+async def run_blocking(func, *args):
+    """Run blocking recorder work in a worker thread to keep the event loop responsive"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, func, *args)
+
+
 async def get_recording_devices():
     """Get list of available recording devices"""
-    return audio_recorder.get_audio_devices()
+    # Serve the body serialized once per device cache refresh
+    body = await run_blocking(audio_recorder.get_audio_devices_json)
+    return Response(content=body, media_type="application/json")
 
 
 async def set_active_device(device_selection: DeviceSelection):
     """Set the active recording device"""
     try:
-        device_id = audio_recorder.set_active_device(device_selection.device_id)
+        device_id = await run_blocking(audio_recorder.set_active_device, device_selection.device_id)
         return {"message": f"Active device set to ID {device_id}"}
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+        raise to_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to set active device: {str(e)}")
 
 
 async def get_active_device():
     """Get the current active recording device"""
-    result = audio_recorder.get_active_device()
+    result = await run_blocking(audio_recorder.get_active_device)
     if result is None:
         return {"active_device_id": None, "message": "No active device set"}
     
@@ -48,33 +81,40 @@ async def get_active_device():
     return result
 
 
-async def start_recording():
-    """Start audio recording with 32-bit float, 2 channels"""
+async def start_recording(start_request: Optional[StartRequest] = None):
+    """Start audio recording with 2 channels as 32-bit float or 16-bit PCM"""
+    start_request = start_request or StartRequest()
     try:
-        result = audio_recorder.start_recording_core()
+        result = await run_blocking(
+            audio_recorder.start_recording_core,
+            start_request.stream_file_path,
+            start_request.dtype
+        )
         return {
             "message": "Recording started",
             **result
         }
     except ValueError as e:
-        if "already in progress" in str(e):
-            raise HTTPException(status_code=409, detail=str(e))
-        else:
-            raise HTTPException(status_code=400, detail=str(e))
+        raise to_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start recording: {str(e)}")
 
 
+async def get_recording_status():
+    """Get the progress of the current or last recording"""
+    return audio_recorder.get_recording_status()
+
+
 async def stop_recording():
     """Stop audio recording"""
     try:
-        result = audio_recorder.stop_recording_core()
+        result = await run_blocking(audio_recorder.stop_recording_core)
         return {
             "message": "Recording stopped",
             **result
         }
     except ValueError as e:
-        raise HTTPException(status_code=409, detail=str(e))
+        raise to_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to stop recording: {str(e)}")
 
@@ -82,16 +122,13 @@ async def stop_recording():
 async def save_recording(save_request: SaveRequest):
     """Save recorded audio to specified file path"""
     try:
-        result = audio_recorder.save_recording_core(save_request.file_path)
+        result = await run_blocking(audio_recorder.save_recording_core, save_request.file_path, save_request.dtype)
         return {
             "message": "Recording saved successfully",
             **result
         }
     except ValueError as e:
-        if "still in progress" in str(e):
-            raise HTTPException(status_code=409, detail=str(e))
-        else:
-            raise HTTPException(status_code=400, detail=str(e))
+        raise to_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save recording: {str(e)}")
 
@@ -99,13 +136,10 @@ async def save_recording(save_request: SaveRequest):
 async def normalize_recording(normalize_request: NormalizeRequest):
     """Normalize recorded audio to specified dB level"""
     try:
-        result = audio_recorder.normalize_recording_core(normalize_request.target_db)
+        result = await run_blocking(audio_recorder.normalize_recording_core, normalize_request.target_db)
         return result
     except ValueError as e:
-        if "still in progress" in str(e):
-            raise HTTPException(status_code=409, detail=str(e))
-        else:
-            raise HTTPException(status_code=400, detail=str(e))
+        raise to_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to normalize recording: {str(e)}")
 
@@ -113,13 +147,10 @@ async def normalize_recording(normalize_request: NormalizeRequest):
 async def learn_noise_floor():
     """Learn noise floor by recording 5 seconds of silence"""
     try:
-        result = audio_recorder.learn_noise_floor_core()
+        result = await run_blocking(audio_recorder.learn_noise_floor_core)
         return result
     except ValueError as e:
-        if "already in progress" in str(e):
-            raise HTTPException(status_code=409, detail=str(e))
-        else:
-            raise HTTPException(status_code=400, detail=str(e))
+        raise to_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to learn noise floor: {str(e)}")
 
@@ -127,13 +158,10 @@ async def learn_noise_floor():
 async def trim_silence(trim_request: TrimSilenceRequest):
     """Trim silence from beginning and end of recording"""
     try:
-        result = audio_recorder.trim_silence_core(trim_request.margin_seconds)
+        result = await run_blocking(audio_recorder.trim_silence_core, trim_request.margin_seconds)
         return result
     except ValueError as e:
-        if "still in progress" in str(e):
-            raise HTTPException(status_code=409, detail=str(e))
-        else:
-            raise HTTPException(status_code=400, detail=str(e))
+        raise to_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to trim silence: {str(e)}")
 
@@ -141,12 +169,9 @@ async def trim_silence(trim_request: TrimSilenceRequest):
 async def analyze_clipping():
     """Check if recording has clipping"""
     try:
-        result = audio_recorder.analyze_clipping_core()
+        result = await run_blocking(audio_recorder.analyze_clipping_core)
         return result
     except ValueError as e:
-        if "still in progress" in str(e):
-            raise HTTPException(status_code=409, detail=str(e))
-        else:
-            raise HTTPException(status_code=400, detail=str(e))
+        raise to_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze clipping: {str(e)}")
\ No newline at end of file
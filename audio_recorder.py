@@ -1,25 +1,134 @@
 import sounddevice
 import numpy
+import functools
+import json
+import math
 import os
 import struct
+import threading
+import time
 from typing import List, Dict, Any, Optional
 
 
+# Initial capacity of the recording buffer, grown geometrically when exceeded
+INITIAL_BUFFER_SECONDS = 60
+
+# Default frames per audio callback, overridable with --block-size
+DEFAULT_BLOCK_SIZE = 4096
+
+# Free capacity left in the recording buffer when a background grow is requested
+BUFFER_HEADROOM_SECONDS = 10
+
+# How long an enumerated device list is reused before PortAudio is queried again
+DEVICE_CACHE_TTL_SECONDS = 2.0
+
+# RIFF, fmt and data chunk headers of a canonical 44-byte WAV header
+WAV_HEADER = struct.Struct('<4sL4s4sLHHLLHH4sL')
+
+# RIFF chunk sizes are unsigned 32-bit and the RIFF size counts 36 header bytes besides the data
+MAX_WAV_DATA_SIZE = 0xFFFFFFFF - 36
+
+# WAV format tag, bytes per sample, full-scale amplitude and description of each capture dtype
+SAMPLE_FORMATS = {
+    'float32': {"format_tag": 3, "sample_width": 4, "full_scale": 1.0, "name": "WAV 32-bit float"},
+    'int16': {"format_tag": 1, "sample_width": 2, "full_scale": 32768.0, "name": "WAV 16-bit PCM"},
+}
+
+# Frames converted at a time when saving in a sample format other than the recorded one
+CONVERSION_BLOCK_FRAMES = 65536
+
+# Captured blocks that may wait for the disk writer when streaming to a file
+STREAM_RING_BLOCKS = 256
+
+
+class RecordingInProgressError(ValueError):
+    """Raised when an operation requires the recording to be stopped"""
+
+
+class NoRecordingInProgressError(ValueError):
+    """Raised when an operation requires a recording in progress"""
+
+
+class DeviceNotFoundError(ValueError):
+    """Raised when a requested device does not exist"""
+
+
+def synchronized(method):
+    """Run a recorder method while holding the recording state lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.state.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class AudioRecordingState:
     """State management for audio recording"""
     
-    def __init__(self, sample_rate: int = 44100):
+    def __init__(self, sample_rate: int = 44100, block_size: int = DEFAULT_BLOCK_SIZE):
+        # Serializes recorder operations that run concurrently in worker threads.
+        # The audio callback never takes it: stopping the stream waits for the
+        # callback, so it relies on ordered publication of write_index instead.
+        self.lock: threading.Lock = threading.Lock()
+        
         # Recording state
         self.is_recording: bool = False
-        self.recording_data: List[numpy.ndarray] = []
+        self.recording_buffer: numpy.ndarray = numpy.empty((0, 2), dtype='float32')
+        self.write_index: int = 0
+        
+        # Background growth of the recording buffer, handed to the audio callback
+        self.pending_buffer: Optional[numpy.ndarray] = None
+        self.pending_copied: int = 0
+        self.grow_requested: bool = False
+        self.grow_event: threading.Event = threading.Event()
+        self.grow_thread: Optional[threading.Thread] = None
+        self.grow_thread_running: bool = False
         self.recording_stream: Optional[sounddevice.InputStream] = None
         self.sample_rate: int = sample_rate
+        # Sample type of the current recording, one of SAMPLE_FORMATS
+        self.dtype: str = 'float32'
+        # Frames per callback; larger blocks mean fewer Python callbacks per second
+        self.block_size: int = block_size
+        # Callbacks flagged with a status such as an input overflow
+        self.callback_status_count: int = 0
         
         # Active recording device
         self.active_device_id: Optional[int] = None
         
         # Noise floor for silence detection
         self.noise_floor: Optional[float] = None
+        # Reused capture buffer for learning the noise floor
+        self.silence_buffer: Optional[numpy.ndarray] = None
+        
+        # Cached device enumeration
+        self.device_lock: threading.RLock = threading.RLock()
+        self.device_cache: Optional[List[Dict[str, Any]]] = None
+        self.device_cache_by_id: Dict[int, Dict[str, Any]] = {}
+        self.device_cache_json: bytes = b''
+        self.device_cache_time: float = 0.0
+        self.hostapis: Optional[tuple] = None
+        
+        # Streaming capture straight to a WAV file; the flag, path and frame
+        # counts describe the latest take and are kept after it finishes
+        self.streamed: bool = False
+        self.stream_file_path: Optional[str] = None
+        self.stream_file = None
+        # Single-producer/single-consumer ring between the audio callback and the
+        # writer thread; only the callback advances head and only the writer tail.
+        # Slots are preallocated blocks the callback copies into, so streaming
+        # allocates nothing per callback however long the recording runs
+        self.stream_slots: Optional[List[numpy.ndarray]] = None
+        self.stream_slot_frames: List[int] = []
+        self.stream_head: int = 0
+        self.stream_tail: int = 0
+        self.stream_event: threading.Event = threading.Event()
+        self.stream_thread: Optional[threading.Thread] = None
+        self.stream_thread_running: bool = False
+        self.streamed_frames: int = 0
+        self.dropped_frames: int = 0
+        # Frames the streamed WAV file can still take before its sizes overflow
+        self.stream_frames_left: int = 0
+        self.stream_limit_reached: bool = False
 
 
 class AudioRecorder:
@@ -31,13 +140,272 @@ class AudioRecorder:
     def audio_callback(self, indata, frames, time, status):
         """Callback function for audio recording"""
         if status:
-            print(f"Audio callback status: {status}")
-        self.state.recording_data.append(indata.copy())
+            # Only count here; printing from the audio thread can itself cause overflows
+            self.state.callback_status_count += 1
+        slots = self.state.stream_slots
+        if slots is not None:
+            head = self.state.stream_head
+            tail = self.state.stream_tail
+            if head - tail >= len(slots):
+                # The writer fell behind and the ring is full
+                self.state.dropped_frames += frames
+                return
+            if frames > self.state.stream_frames_left:
+                # The WAV file is full; keep the take valid and count the rest as dropped
+                self.state.stream_limit_reached = True
+                self.state.dropped_frames += frames
+                return
+            self.state.stream_frames_left -= frames
+            # Hand a little-endian copy of the block to the disk writer thread
+            index = head % len(slots)
+            if frames > len(slots[index]):
+                # Only when the host delivers more than block_size frames
+                slots[index] = numpy.empty((frames, indata.shape[1]), dtype=slots[index].dtype)
+            numpy.copyto(slots[index][:frames], indata)
+            self.state.stream_slot_frames[index] = frames
+            self.state.stream_head = head + 1
+            if head == self.state.stream_tail:
+                # Only wake the writer when the ring was empty; otherwise it is still draining
+                self.state.stream_event.set()
+            return
+        start = self.state.write_index
+        end = start + frames
+        pending_buffer = self.state.pending_buffer
+        if pending_buffer is not None:
+            # Adopt the buffer grown in the background; only the frames written
+            # since its bulk copy still have to be carried over
+            self.state.pending_buffer = None
+            if len(pending_buffer) > len(self.state.recording_buffer):
+                copied = self.state.pending_copied
+                pending_buffer[copied:start] = self.state.recording_buffer[copied:start]
+                self.state.recording_buffer = pending_buffer
+            self.state.grow_requested = False
+        if end > len(self.state.recording_buffer):
+            # The background grow fell behind; grow on the audio thread instead
+            self.grow_recording_buffer(end)
+        # Copy into preallocated memory instead of allocating a new array per block
+        self.state.recording_buffer[start:end] = indata
+        # Publish the new frames only after they have been copied
+        self.state.write_index = end
+        
+        headroom = len(self.state.recording_buffer) - end
+        if headroom < BUFFER_HEADROOM_SECONDS * self.state.sample_rate and not self.state.grow_requested:
+            self.state.grow_requested = True
+            self.state.grow_event.set()
+
+    def grow_recording_buffer(self, min_frames: int):
+        """Grow the recording buffer geometrically to hold at least min_frames"""
+        old_buffer = self.state.recording_buffer
+        capacity = max(len(old_buffer) * 2, min_frames)
+        new_buffer = numpy.empty((capacity, old_buffer.shape[1]), dtype=old_buffer.dtype)
+        new_buffer[:self.state.write_index] = old_buffer[:self.state.write_index]
+        self.state.recording_buffer = new_buffer
+
+    def buffer_grower(self):
+        """Grow the recording buffer ahead of time so the audio callback does not allocate"""
+        while True:
+            self.state.grow_event.wait()
+            self.state.grow_event.clear()
+            if not self.state.grow_thread_running:
+                break
+            # Read the index before the buffer, as in get_recording, so the buffer covers it
+            copied = self.state.write_index
+            old_buffer = self.state.recording_buffer
+            new_buffer = numpy.empty((len(old_buffer) * 2, old_buffer.shape[1]), dtype=old_buffer.dtype)
+            new_buffer[:copied] = old_buffer[:copied]
+            # Publish the buffer last; the callback copies the remaining frames and swaps it in
+            self.state.pending_copied = copied
+            self.state.pending_buffer = new_buffer
+
+    def start_buffer_grower(self):
+        """Start the thread that grows the recording buffer in the background"""
+        # Never run two growers on the same event
+        self.stop_buffer_grower()
+        self.state.pending_buffer = None
+        self.state.grow_requested = False
+        self.state.grow_event.clear()
+        self.state.grow_thread_running = True
+        self.state.grow_thread = threading.Thread(target=self.buffer_grower, daemon=True)
+        self.state.grow_thread.start()
+
+    def stop_buffer_grower(self):
+        """Stop the background buffer grower and drop any unused grown buffer"""
+        if self.state.grow_thread is None:
+            return
+        self.state.grow_thread_running = False
+        self.state.grow_event.set()
+        self.state.grow_thread.join()
+        self.state.grow_thread = None
+        self.state.pending_buffer = None
+
+    def acquire_recording_buffer(self, capacity: int, dtype: str) -> numpy.ndarray:
+        """Reuse the previous recording's buffer for a new take when it is large enough"""
+        old_buffer = self.state.recording_buffer
+        # Edits such as trimming leave a view; reuse the whole array behind it
+        if isinstance(old_buffer.base, numpy.ndarray):
+            old_buffer = old_buffer.base
+        if (capacity > 0 and old_buffer.ndim == 2 and old_buffer.dtype == dtype
+                and len(old_buffer) >= capacity and old_buffer.flags.writeable):
+            return old_buffer
+        return numpy.empty((capacity, 2), dtype=dtype)
+
+    def get_recording(self) -> numpy.ndarray:
+        """Get the recorded frames as a view into the recording buffer"""
+        # Read the index before the buffer: the callback swaps in a grown buffer
+        # before it publishes a larger index, so the buffer always covers it
+        write_index = self.state.write_index
+        return self.state.recording_buffer[:write_index]
+
+    def replace_recording(self, recording: numpy.ndarray):
+        """Replace the recorded frames with edited audio"""
+        # Hide the old frames first so readers never pair the old index with the new buffer
+        self.state.write_index = 0
+        self.state.recording_buffer = recording
+        self.state.write_index = len(recording)
+
+    def build_wav_header(self, data_size: int, dtype: str) -> bytes:
+        """Build the header of a stereo WAV file holding samples of the given dtype"""
+        channels = 2
+        sample_format = SAMPLE_FORMATS[dtype]
+        sample_width = sample_format["sample_width"]
+        frame_rate = self.state.sample_rate
+        return WAV_HEADER.pack(
+            b'RIFF', 36 + data_size, b'WAVE',
+            b'fmt ', 16,  # chunk size
+            sample_format["format_tag"],
+            channels,
+            frame_rate,
+            frame_rate * channels * sample_width,  # byte rate
+            channels * sample_width,  # block align
+            sample_width * 8,  # bits per sample
+            b'data', data_size
+        )
+
+    def ensure_directory(self, file_path: str):
+        """Create the parent directory of file_path if it does not exist"""
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def start_streaming(self, file_path: str):
+        """Open a WAV file and start the thread that writes captured blocks to it"""
+        self.ensure_directory(file_path)
+        stream_file = open(file_path, 'wb', buffering=1 << 20)
+        try:
+            # Placeholder header, the sizes are patched in when streaming finishes
+            stream_file.write(self.build_wav_header(0, self.state.dtype))
+        except Exception:
+            stream_file.close()
+            os.remove(file_path)
+            raise
+        
+        self.state.streamed = True
+        self.state.stream_file_path = file_path
+        self.state.stream_file = stream_file
+        slot_dtype = numpy.dtype(self.state.dtype).newbyteorder('<')
+        self.state.stream_slots = [
+            numpy.empty((self.state.block_size, 2), dtype=slot_dtype) for _ in range(STREAM_RING_BLOCKS)
+        ]
+        self.state.stream_slot_frames = [0] * STREAM_RING_BLOCKS
+        self.state.stream_head = 0
+        self.state.stream_tail = 0
+        self.state.stream_event.clear()
+        self.state.streamed_frames = 0
+        self.state.dropped_frames = 0
+        self.state.stream_frames_left = MAX_WAV_DATA_SIZE // (2 * SAMPLE_FORMATS[self.state.dtype]["sample_width"])
+        self.state.stream_limit_reached = False
+        self.state.stream_thread_running = True
+        self.state.stream_thread = threading.Thread(
+            target=self.stream_writer,
+            args=(self.state.stream_slots, stream_file),
+            daemon=True
+        )
+        self.state.stream_thread.start()
+
+    def stream_writer(self, slots: List[numpy.ndarray], stream_file):
+        """Write captured blocks to the streamed WAV file until the ring is drained and stopped"""
+        while True:
+            tail = self.state.stream_tail
+            if tail == self.state.stream_head:
+                if not self.state.stream_thread_running:
+                    break
+                # Clear before re-checking so a block published in between still wakes us
+                self.state.stream_event.clear()
+                if tail == self.state.stream_head and self.state.stream_thread_running:
+                    self.state.stream_event.wait()
+                continue
+            index = tail % len(slots)
+            frames = self.state.stream_slot_frames[index]
+            stream_file.write(slots[index][:frames])
+            self.state.streamed_frames += frames
+            # Hand the slot back to the callback only after it has been written
+            self.state.stream_tail = tail + 1
+
+    def finish_streaming(self):
+        """Drain the writer thread and finalize the streamed WAV file"""
+        self.state.stream_thread_running = False
+        self.state.stream_event.set()
+        self.state.stream_thread.join()
+        
+        data_size = self.state.streamed_frames * 2 * SAMPLE_FORMATS[self.state.dtype]["sample_width"]
+        file_path = self.state.stream_file_path
+        stream_file = self.state.stream_file
+        # Clear the streaming state first so a failure below cannot leak into the next take
+        self.state.stream_file = None
+        self.state.stream_slots = None
+        self.state.stream_thread = None
+        try:
+            stream_file.seek(0)
+            stream_file.write(self.build_wav_header(data_size, self.state.dtype))
+        finally:
+            stream_file.close()
+        
+        return {
+            "file_path": file_path,
+            "file_size_bytes": int(WAV_HEADER.size + data_size),
+            "recorded_samples": int(self.state.streamed_frames),
+            "recorded_duration": float(self.state.streamed_frames / self.state.sample_rate),
+            "dropped_samples": int(self.state.dropped_frames),
+            "size_limit_reached": self.state.stream_limit_reached
+        }
 
     def get_audio_devices(self):
         """Get list of available audio input devices"""
+        with self.state.device_lock:
+            now = time.monotonic()
+            if self.state.device_cache is not None and now - self.state.device_cache_time < DEVICE_CACHE_TTL_SECONDS:
+                return self.state.device_cache
+            
+            self.state.device_cache = self.query_audio_devices()
+            self.state.device_cache_by_id = {device['id']: device for device in self.state.device_cache}
+            self.state.device_cache_json = json.dumps(
+                self.state.device_cache, ensure_ascii=False, separators=(',', ':')
+            ).encode('utf-8')
+            self.state.device_cache_time = now
+            return self.state.device_cache
+
+    def get_audio_devices_json(self) -> bytes:
+        """Get the list of audio input devices pre-serialized as a JSON body"""
+        with self.state.device_lock:
+            self.get_audio_devices()
+            return self.state.device_cache_json
+
+    def get_audio_device(self, device_id: int) -> Optional[Dict[str, Any]]:
+        """Get an audio input device by ID, or None if it is not available"""
+        with self.state.device_lock:
+            self.get_audio_devices()
+            return self.state.device_cache_by_id.get(device_id)
+
+    def get_hostapis(self):
+        """Get host APIs, which PortAudio fixes for the lifetime of the process"""
+        if self.state.hostapis is None:
+            self.state.hostapis = sounddevice.query_hostapis()
+        return self.state.hostapis
+
+    def query_audio_devices(self):
+        """Enumerate audio input devices through PortAudio"""
         devices = sounddevice.query_devices()
-        hostapis = sounddevice.query_hostapis()
+        hostapis = self.get_hostapis()
         device_list = []
         
         for i, device in enumerate(devices):
@@ -59,14 +427,12 @@ class AudioRecorder:
         
         return device_list
 
+    @synchronized
     def set_active_device(self, device_id: int):
         """Set the active recording device"""
         # Check if device exists
-        devices = self.get_audio_devices()
-        device_ids = [device['id'] for device in devices]
-        
-        if device_id not in device_ids:
-            raise ValueError("Device ID not found")
+        if self.get_audio_device(device_id) is None:
+            raise DeviceNotFoundError("Device ID not found")
         
         self.state.active_device_id = device_id
         return self.state.active_device_id
@@ -77,71 +443,127 @@ class AudioRecorder:
             return None
         
         # Get active device details
-        devices = self.get_audio_devices()
-        active_device = next((device for device in devices if device['id'] == self.state.active_device_id), None)
+        active_device = self.get_audio_device(self.state.active_device_id)
         
         return {
             "active_device_id": self.state.active_device_id,
             "device_info": active_device
         }
 
-    def start_recording_core(self):
+    def get_recording_status(self):
+        """Get the progress of the current or last recording"""
+        streamed = self.state.streamed
+        recorded_samples = self.state.streamed_frames if streamed else self.state.write_index
+        
+        return {
+            "is_recording": self.state.is_recording,
+            "recorded_samples": int(recorded_samples),
+            "recorded_duration": float(recorded_samples / self.state.sample_rate),
+            "stream_file_path": self.state.stream_file_path if streamed else None,
+            "dropped_samples": int(self.state.dropped_frames if streamed else 0),
+            "callback_status_count": int(self.state.callback_status_count)
+        }
+
+    @synchronized
+    def start_recording_core(self, stream_file_path: Optional[str] = None, dtype: str = 'float32'):
         """Core recording start logic"""
+        if dtype not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        
         if self.state.is_recording:
             # Stop existing recording and reset state
             if self.state.recording_stream:
                 self.state.recording_stream.stop()
                 self.state.recording_stream.close()
                 self.state.recording_stream = None
+            self.stop_buffer_grower()
+            if self.state.stream_slots is not None:
+                self.finish_streaming()
             self.state.is_recording = False
         
         if self.state.active_device_id is None:
             raise ValueError("No active device set")
         
         # Check if active device is still available
-        devices = self.get_audio_devices()
-        active_device = next((device for device in devices if device['id'] == self.state.active_device_id), None)
+        active_device = self.get_audio_device(self.state.active_device_id)
         
         if active_device is None:
             raise ValueError("Active device is not available")
         
-        # Clear previous recording data
-        self.state.recording_data = []
+        # Clear previous recording data; a streamed recording needs no buffer
+        capacity = 0 if stream_file_path else self.state.sample_rate * INITIAL_BUFFER_SECONDS
+        self.state.write_index = 0
+        self.state.recording_buffer = self.acquire_recording_buffer(capacity, dtype)
+        self.state.dtype = dtype
+        self.state.callback_status_count = 0
         
         # Create and start input stream
         self.state.recording_stream = sounddevice.InputStream(
             samplerate=self.state.sample_rate,
             channels=2,
-            dtype='float32',
+            dtype=dtype,
             device=self.state.active_device_id,
-            callback=self.audio_callback
+            callback=self.audio_callback,
+            blocksize=self.state.block_size,
+            latency='high'
         )
-        self.state.recording_stream.start()
+        
+        # The callback routes blocks by stream_slots; never leave a previous take's ring in place
+        self.state.stream_slots = None
+        self.state.streamed = False
+        try:
+            # When streaming, audio goes to the file only and is not kept in memory
+            if stream_file_path:
+                self.start_streaming(stream_file_path)
+            else:
+                self.start_buffer_grower()
+            
+            self.state.recording_stream.start()
+        except Exception:
+            # Undo the partial start so no writer thread, open file or grower is left behind
+            self.state.recording_stream.close()
+            self.state.recording_stream = None
+            self.stop_buffer_grower()
+            if self.state.stream_slots is not None:
+                # Nothing was recorded, so do not leave an empty WAV file behind
+                os.remove(self.finish_streaming()["file_path"])
+                self.state.streamed = False
+            raise
         self.state.is_recording = True
         
         return {
             "device_id": self.state.active_device_id,
             "sample_rate": self.state.sample_rate,
             "channels": 2,
-            "dtype": "float32"
+            "dtype": dtype,
+            "stream_file_path": stream_file_path
         }
 
+    @synchronized
     def stop_recording_core(self):
         """Core recording stop logic"""
         if not self.state.is_recording:
-            raise ValueError("No recording in progress")
+            raise NoRecordingInProgressError("No recording in progress")
         
         if self.state.recording_stream:
             self.state.recording_stream.stop()
             self.state.recording_stream.close()
             self.state.recording_stream = None
         
+        self.stop_buffer_grower()
         self.state.is_recording = False
         
-        if self.state.recording_data:
-            # Concatenate all recorded chunks
-            full_recording = numpy.concatenate(self.state.recording_data, axis=0)
-            recorded_samples = len(full_recording)
+        if self.state.stream_slots is not None:
+            return {
+                **self.finish_streaming(),
+                "sample_rate": self.state.sample_rate,
+                "channels": 2,
+                "dtype": self.state.dtype
+            }
+        
+        if self.state.write_index > 0:
+            # The write index already is the frame count; no need to touch the audio
+            recorded_samples = self.state.write_index
             recorded_duration = recorded_samples / self.state.sample_rate
             
             return {
@@ -149,84 +571,103 @@ class AudioRecorder:
                 "recorded_duration": float(recorded_duration),
                 "sample_rate": self.state.sample_rate,
                 "channels": 2,
-                "dtype": "float32"
+                "dtype": self.state.dtype
             }
         else:
             return {"recorded_samples": 0, "recorded_duration": 0.0}
 
-    def save_recording_core(self, file_path: str):
+    def scale_block(self, block: numpy.ndarray, factor: float, scratch: numpy.ndarray, out: numpy.ndarray):
+        """Scale a block of samples into out through a float32 scratch block of the same shape"""
+        numpy.multiply(block, factor, out=scratch)
+        if out.dtype.kind == 'i':
+            # Round and clip to the integer range, +1.0 maps just past the largest value
+            numpy.rint(scratch, out=scratch)
+            limits = numpy.iinfo(out.dtype)
+            numpy.clip(scratch, limits.min, limits.max, out=scratch)
+        numpy.copyto(out, scratch, casting='unsafe')
+
+    def write_converted_samples(self, f, recording: numpy.ndarray, dtype: str):
+        """Write samples converted to another sample format, one block at a time"""
+        scale = SAMPLE_FORMATS[dtype]["full_scale"] / SAMPLE_FORMATS[self.state.dtype]["full_scale"]
+        scaled = numpy.empty((CONVERSION_BLOCK_FRAMES, 2), dtype=numpy.float32)
+        converted = numpy.empty((CONVERSION_BLOCK_FRAMES, 2), dtype=numpy.dtype(dtype).newbyteorder('<'))
+        
+        for start in range(0, len(recording), CONVERSION_BLOCK_FRAMES):
+            block = recording[start:start + CONVERSION_BLOCK_FRAMES]
+            block_converted = converted[:len(block)]
+            self.scale_block(block, scale, scaled[:len(block)], block_converted)
+            f.write(block_converted)
+
+    @synchronized
+    def save_recording_core(self, file_path: str, dtype: Optional[str] = None):
         """Core recording save logic"""
         if self.state.is_recording:
-            raise ValueError("Recording is still in progress. Stop recording first.")
+            raise RecordingInProgressError("Recording is still in progress. Stop recording first.")
         
-        if not self.state.recording_data:
+        if self.state.write_index == 0:
             raise ValueError("No recording data available to save")
         
-        # Concatenate all recorded chunks
-        full_recording = numpy.concatenate(self.state.recording_data, axis=0)
+        # Save in the recorded sample format unless another one is requested
+        dtype = dtype or self.state.dtype
+        if dtype not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        
+        full_recording = self.get_recording()
+        
+        # WAV file parameters
+        channels = 2
+        sample_format = SAMPLE_FORMATS[dtype]
+        sample_width = sample_format["sample_width"]
+        num_frames = len(full_recording)
+        
+        # Calculate file sizes
+        data_size = num_frames * channels * sample_width
+        
+        # RIFF chunk sizes are unsigned 32-bit, check before creating the file
+        if data_size > MAX_WAV_DATA_SIZE:
+            raise ValueError("Recording is too large to save as a WAV file")
         
         # Ensure directory exists
-        directory = os.path.dirname(file_path)
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory)
-        
-        # Save as 32-bit float WAV file with manual RIFF header
-        with open(file_path, 'wb') as f:
-            # WAV file parameters
-            channels = 2
-            sample_width = 4  # 32-bit float
-            frame_rate = self.state.sample_rate
-            num_frames = len(full_recording)
-            
-            # Calculate file sizes
-            data_size = num_frames * channels * sample_width
-            file_size = 36 + data_size
-            
-            # Write RIFF header
-            f.write(b'RIFF')
-            f.write(struct.pack('<L', file_size))
-            f.write(b'WAVE')
-            
-            # Write fmt chunk
-            f.write(b'fmt ')
-            f.write(struct.pack('<L', 16))  # chunk size
-            f.write(struct.pack('<H', 3))   # IEEE float format
-            f.write(struct.pack('<H', channels))
-            f.write(struct.pack('<L', frame_rate))
-            f.write(struct.pack('<L', frame_rate * channels * sample_width))  # byte rate
-            f.write(struct.pack('<H', channels * sample_width))  # block align
-            f.write(struct.pack('<H', sample_width * 8))  # bits per sample
+        self.ensure_directory(file_path)
+        
+        # Save as WAV file with manual RIFF header
+        with open(file_path, 'wb', buffering=1 << 20) as f:
+            # Write RIFF, fmt and data chunk headers in one go
+            f.write(self.build_wav_header(data_size, dtype))
             
-            # Write data chunk
-            f.write(b'data')
-            f.write(struct.pack('<L', data_size))
-            f.write(full_recording.tobytes())
+            if dtype == self.state.dtype:
+                # Stream samples straight from the array buffer without a bytes copy;
+                # WAV is little-endian, which only costs a conversion on big-endian hosts
+                full_recording.astype(full_recording.dtype.newbyteorder('<'), copy=False).tofile(f)
+            else:
+                self.write_converted_samples(f, full_recording, dtype)
         
-        file_size = os.path.getsize(file_path)
         recorded_duration = len(full_recording) / self.state.sample_rate
         
         return {
             "file_path": file_path,
-            "file_size_bytes": int(file_size),
+            "file_size_bytes": int(WAV_HEADER.size + data_size),
             "recorded_duration": float(recorded_duration),
             "sample_rate": int(self.state.sample_rate),
             "channels": 2,
-            "format": "WAV 32-bit float"
+            "format": sample_format["name"]
         }
 
+    @synchronized
     def normalize_recording_core(self, target_db: float = 0.0):
         """Normalize recording data to specified dB level"""
         if self.state.is_recording:
-            raise ValueError("Recording is still in progress. Stop recording first.")
+            raise RecordingInProgressError("Recording is still in progress. Stop recording first.")
         
-        if not self.state.recording_data:
+        if self.state.write_index == 0:
             raise ValueError("No recording data available to normalize")
         
-        # Concatenate all recorded chunks
-        full_recording = numpy.concatenate(self.state.recording_data, axis=0)
+        full_recording = self.get_recording()
         
-        # Find the maximum absolute value across all channels
-        max_amplitude = numpy.max(numpy.abs(full_recording))
+        # Find the maximum absolute value across all channels relative to full
+        # scale; two streaming reductions avoid a full-size abs() temporary
+        full_scale = SAMPLE_FORMATS[self.state.dtype]["full_scale"]
+        max_amplitude = max(-float(full_recording.min()), float(full_recording.max())) / full_scale
         
         if max_amplitude == 0:
             raise ValueError("Recording contains only silence, cannot normalize")
@@ -238,16 +679,23 @@ class AudioRecorder:
         # Calculate normalization factor
         normalization_factor = target_amplitude / max_amplitude
         
-        # Apply normalization
-        normalized_recording = full_recording * normalization_factor
-        
-        # Replace recording data with normalized version
-        self.state.recording_data = [normalized_recording]
+        # Apply normalization in place to avoid allocating a second copy
+        if full_recording.dtype.kind == 'f':
+            numpy.multiply(full_recording, normalization_factor, out=full_recording)
+        else:
+            # Integer samples are scaled in float32 one block at a time, then rounded
+            # and clipped to their range, so no full-size float copy is needed
+            scaled = numpy.empty((CONVERSION_BLOCK_FRAMES, 2), dtype=numpy.float32)
+            for start in range(0, len(full_recording), CONVERSION_BLOCK_FRAMES):
+                block = full_recording[start:start + CONVERSION_BLOCK_FRAMES]
+                self.scale_block(block, normalization_factor, scaled[:len(block)], block)
+        normalized_recording = full_recording
         
         # Calculate original peak in dB
-        original_peak_db = 20.0 * numpy.log10(max_amplitude) if max_amplitude > 0 else -numpy.inf
-        new_peak = numpy.max(numpy.abs(normalized_recording))
-        new_peak_db = 20.0 * numpy.log10(new_peak) if new_peak > 0 else -numpy.inf
+        original_peak_db = 20.0 * math.log10(max_amplitude)
+        # Scaling is a pure multiply, so the new peak is exactly the target
+        new_peak = target_amplitude
+        new_peak_db = target_db
         
         return {
             "message": "Recording normalized",
@@ -261,34 +709,35 @@ class AudioRecorder:
             "recorded_duration": float(len(normalized_recording) / self.state.sample_rate)
         }
 
+    @synchronized
     def learn_noise_floor_core(self):
         """Learn noise floor by recording 5 seconds of silence"""
         if self.state.is_recording:
-            raise ValueError("Recording already in progress")
+            raise RecordingInProgressError("Recording already in progress")
         
         if self.state.active_device_id is None:
             raise ValueError("No active device set")
         
         # Check if active device is still available
-        devices = self.get_audio_devices()
-        active_device = next((device for device in devices if device['id'] == self.state.active_device_id), None)
+        active_device = self.get_audio_device(self.state.active_device_id)
         
         if active_device is None:
             raise ValueError("Active device is not available")
         
-        # Record 5 seconds of silence
+        # Record 5 seconds of silence into a buffer kept across calls
         silence_duration = 5.0
+        silence_frames = int(silence_duration * self.state.sample_rate)
+        if self.state.silence_buffer is None or len(self.state.silence_buffer) != silence_frames:
+            self.state.silence_buffer = numpy.empty((silence_frames, 2), dtype='float32')
         silence_data = sounddevice.rec(
-            int(silence_duration * self.state.sample_rate),
+            out=self.state.silence_buffer,
             samplerate=self.state.sample_rate,
-            channels=2,
-            dtype='float32',
             device=self.state.active_device_id
         )
         sounddevice.wait()
         
-        # Calculate RMS noise floor
-        rms_noise = numpy.sqrt(numpy.mean(silence_data ** 2))
+        # Calculate RMS noise floor; einsum sums the squares without a squared copy
+        rms_noise = math.sqrt(float(numpy.einsum('ij,ij->', silence_data, silence_data)) / silence_data.size)
         self.state.noise_floor = rms_noise * 2.0  # Add some margin for detection
         
         return {
@@ -299,42 +748,44 @@ class AudioRecorder:
             "sample_rate": int(self.state.sample_rate)
         }
 
+    @synchronized
     def trim_silence_core(self, margin_seconds: float = 0.1):
         """Trim silence from beginning and end of recording"""
         if self.state.is_recording:
-            raise ValueError("Recording is still in progress. Stop recording first.")
+            raise RecordingInProgressError("Recording is still in progress. Stop recording first.")
         
-        if not self.state.recording_data:
+        if self.state.write_index == 0:
             raise ValueError("No recording data available to trim")
         
         if self.state.noise_floor is None:
             raise ValueError("Noise floor not learned. Use learn_noise_floor endpoint first.")
         
-        # Concatenate all recorded chunks
-        full_recording = numpy.concatenate(self.state.recording_data, axis=0)
+        full_recording = self.get_recording()
         
         # Calculate RMS in small windows
         window_size = int(0.01 * self.state.sample_rate)  # 10ms windows
         num_windows = len(full_recording) // window_size
         
-        rms_values = []
-        for i in range(num_windows):
-            start = i * window_size
-            end = start + window_size
-            window_data = full_recording[start:end]
-            rms = numpy.sqrt(numpy.mean(window_data ** 2))
-            rms_values.append(rms)
-        
-        rms_values = numpy.array(rms_values)
-        
-        # Find first and last non-silent windows
-        non_silent = rms_values > self.state.noise_floor
-        
-        if not numpy.any(non_silent):
+        # One row per window holding the samples of both channels, so the
+        # sum of squares for all windows is a single einsum reduction;
+        # float32 accumulation keeps integer samples from overflowing
+        windows = full_recording[:num_windows * window_size].reshape(num_windows, window_size * 2)
+        square_sums = numpy.einsum('ij,ij->i', windows, windows, dtype=numpy.float32)
+        # Mean and root in place, staying in float32
+        square_sums *= numpy.float32(1.0 / (window_size * 2))
+        rms_values = numpy.sqrt(square_sums, out=square_sums)
+        
+        # Find first and last non-silent windows; the noise floor is learned
+        # in float samples, so scale it to the recorded sample format
+        full_scale = SAMPLE_FORMATS[self.state.dtype]["full_scale"]
+        non_silent = rms_values > numpy.float32(self.state.noise_floor * full_scale)
+        
+        sound_windows = numpy.flatnonzero(non_silent)
+        if sound_windows.size == 0:
             raise ValueError("Entire recording is below noise floor")
         
-        first_sound = numpy.argmax(non_silent)
-        last_sound = len(non_silent) - 1 - numpy.argmax(non_silent[::-1])
+        first_sound = int(sound_windows[0])
+        last_sound = int(sound_windows[-1])
         
         # Convert to sample indices
         start_sample = max(0, first_sound * window_size - int(margin_seconds * self.state.sample_rate))
@@ -344,7 +795,7 @@ class AudioRecorder:
         trimmed_recording = full_recording[start_sample:end_sample]
         
         # Replace recording data with trimmed version
-        self.state.recording_data = [trimmed_recording]
+        self.replace_recording(trimmed_recording)
         
         original_duration = len(full_recording) / self.state.sample_rate
         trimmed_duration = len(trimmed_recording) / self.state.sample_rate
@@ -363,20 +814,29 @@ class AudioRecorder:
             "samples_removed_end": int(len(full_recording) - end_sample)
         }
 
+    @synchronized
     def analyze_clipping_core(self):
         """Check if recording has clipping (peaks at 0dB)"""
         if self.state.is_recording:
-            raise ValueError("Recording is still in progress. Stop recording first.")
+            raise RecordingInProgressError("Recording is still in progress. Stop recording first.")
         
-        if not self.state.recording_data:
+        if self.state.write_index == 0:
             raise ValueError("No recording data available to analyze")
         
-        # Concatenate all recorded chunks
-        full_recording = numpy.concatenate(self.state.recording_data, axis=0)
+        full_recording = self.get_recording()
+        
+        # Check for clipping (values at or very close to full scale); min/max
+        # also avoids abs() overflowing on the most negative integer sample
+        clipping_threshold = 0.99 * SAMPLE_FORMATS[self.state.dtype]["full_scale"]
         
-        # Check for clipping (values at or very close to 1.0/-1.0)
-        clipping_threshold = 0.99
-        has_clipping = numpy.any(numpy.abs(full_recording) >= clipping_threshold)
+        # Scan one second at a time so clipping early in the recording returns early
+        block_frames = self.state.sample_rate
+        has_clipping = False
+        for start in range(0, len(full_recording), block_frames):
+            block = full_recording[start:start + block_frames]
+            if max(-float(block.min()), float(block.max())) >= clipping_threshold:
+                has_clipping = True
+                break
         
         return {"has_clipping": bool(has_clipping)}
 
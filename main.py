@@ -1,6 +1,7 @@
 from fastapi import FastAPI
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import api_handlers
+import audio_recorder
 
 app = FastAPI(title="Audio Recorder API", version="1.0.0")
 
@@ -22,9 +23,14 @@ async def get_active_device():
 
 # Recording control endpoints
 @app.post("/api/v1/record/start")
-async def start_recording():
-    """Start audio recording with 32-bit float, 2 channels"""
-    return await api_handlers.start_recording()
+async def start_recording(start_request: Optional[api_handlers.StartRequest] = None):
+    """Start audio recording with 2 channels as 32-bit float or 16-bit PCM, optionally streaming to a WAV file"""
+    return await api_handlers.start_recording(start_request)
+
+@app.get("/api/v1/record/status")
+async def get_recording_status():
+    """Get recording progress and audio callback status counts"""
+    return await api_handlers.get_recording_status()
 
 @app.post("/api/v1/record/stop")
 async def stop_recording():
@@ -65,7 +71,13 @@ def main():
     parser = argparse.ArgumentParser(description="Audio Recorder API server.")
     parser.add_argument("--host", type=str, default="0.0.0.0", help="Host to bind the server to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind the server to")
+    parser.add_argument("--block-size", type=int, default=audio_recorder.DEFAULT_BLOCK_SIZE, help="Frames per audio callback while recording")
     args = parser.parse_args()
+    # 0 would let PortAudio vary the block size, which the streaming ring is not sized for
+    if args.block_size < 1:
+        parser.error("--block-size must be at least 1")
+
+    audio_recorder.audio_recorder.state.block_size = args.block_size
 
     uvicorn.run(app, host=args.host, port=args.port)
 
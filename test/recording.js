@@ -52,9 +52,13 @@ function testGetActiveDevice() {
     });
 }
 
-function testStartRecording() {
+function testStartRecording(streamFilePath = null, dtype = 'float32') {
     fetch('http://localhost:8000/api/v1/record/start', {
-        method: 'POST'
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ stream_file_path: streamFilePath, dtype: dtype })
     })
     .then(response => {
         if (!response.ok) {
@@ -70,6 +74,22 @@ function testStartRecording() {
     });
 }
 
+function testGetRecordingStatus() {
+    fetch('http://localhost:8000/api/v1/record/status')
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return response.json();
+    })
+    .then(data => {
+        console.log('Recording status:', data);
+    })
+    .catch(error => {
+        console.error('Error fetching recording status:', error);
+    });
+}
+
 function testStopRecording() {
     fetch('http://localhost:8000/api/v1/record/stop', {
         method: 'POST'
@@ -88,13 +108,13 @@ function testStopRecording() {
     });
 }
 
-function testSaveRecording(filePath) {
+function testSaveRecording(filePath, dtype = null) {
     fetch('http://localhost:8000/api/v1/record/save', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
-        body: JSON.stringify({ file_path: filePath })
+        body: JSON.stringify({ file_path: filePath, dtype: dtype })
     })
     .then(response => {
         if (!response.ok) {